@@ -7,6 +7,8 @@ Separate from the mesh controller — this talks to org.bluez (bluetoothd),
 not org.bluez.mesh (bluetooth-meshd).
 """
 
+import binascii
+import os
 import struct
 
 import dbus
@@ -46,23 +48,45 @@ STATE_CONNECTING = "CONNECTING"
 STATE_RESOLVING = "RESOLVING"
 STATE_READY = "READY"
 
+# WriteValue options, built once rather than per write. "request" is an ATT
+# Write Request (acked per write); "command" is Write Without Response,
+# which BlueZ can pipeline several of per connection interval.
+_WRITE_OPTS_REQUEST = dbus.Dictionary({"type": dbus.String("request")}, signature="sv")
+_WRITE_OPTS_COMMAND = dbus.Dictionary({"type": dbus.String("command")}, signature="sv")
+
+_NO_OPTIONS = dbus.Dictionary({}, signature="sv")
+
+# Setter updates arriving within this window are coalesced (last value wins)
+COALESCE_MS = 20
+
 # --- ZYBL wire protocol ---
 
 ZYBL_HEADER = bytes([0x24, 0x3C])
 
+# Precompiled packers, so the format isn't re-parsed on every frame
+_S_H = struct.Struct("<H")
+_S_HB = struct.Struct("<HB")
+_S_HHH = struct.Struct("<HHH")
+_S_FRAME_HEAD = struct.Struct("<2sBBHHH")  # header, len, pad, field1, seq, cid
+_S_F = struct.Struct("<f")
+_S_FB = struct.Struct("<fb")
+_S_FFH = struct.Struct("<ffH")
+
+
+ZYBL_FIELD1 = 0x0100
+
+
+def _crc16_xmodem(data, crc=0x0000):
+    """CRC-16/XMODEM: poly=0x1021, init=0, no reflect, no xor out.
+
+    binascii.crc_hqx is the same CRC implemented in C in the stdlib.
+    Pass a previous result as `crc` to continue over more data.
+    """
+    return binascii.crc_hqx(data, crc)
 
-def _crc16_xmodem(data):
-    """CRC-16/XMODEM: poly=0x1021, init=0, no reflect, no xor out."""
-    crc = 0x0000
-    for byte in data:
-        crc ^= byte << 8
-        for _ in range(8):
-            if crc & 0x8000:
-                crc = (crc << 1) ^ 0x1021
-            else:
-                crc = crc << 1
-            crc &= 0xFFFF
-    return crc
+
+# CRC state after the constant field1 bytes that open every data section
+_FIELD1_CRC = _crc16_xmodem(_S_H.pack(ZYBL_FIELD1))
 
 
 def zybl_frame(cid, payload=b"", seq=1):
@@ -71,27 +95,31 @@ def zybl_frame(cid, payload=b"", seq=1):
     Data section: field1(u16 LE) + seq(u16 LE) + cid(u16 LE) + payload
     Frame: header(2) + len(1) + 0x00(1) + data_section(N) + crc(2 LE)
     """
-    data_section = struct.pack("<HHH", 0x0100, seq, cid) + payload
-    crc = _crc16_xmodem(data_section)
-    length = len(data_section)
-    return ZYBL_HEADER + bytes([length, 0x00]) + data_section + struct.pack("<H", crc)
+    head = _S_FRAME_HEAD.pack(ZYBL_HEADER, 6 + len(payload), 0x00, ZYBL_FIELD1, seq, cid) + payload
+    # CRC covers the data section; resume past field1 from its precomputed state
+    crc = _crc16_xmodem(head[6:], _FIELD1_CRC)
+    return head + _S_H.pack(crc)
 
 
 def zybl_parse(raw):
-    """Parse a ZYBL frame. Returns (seq, cid, payload) or None on error."""
-    if len(raw) < 10:  # minimum: 2 header + 1 len + 1 pad + 6 data_section_min + 2 crc
+    """Parse a ZYBL frame. Returns (seq, cid, payload) or None on error.
+
+    raw may be any bytes-like object; slicing goes through a memoryview so
+    only the returned payload is copied.
+    """
+    mv = memoryview(raw)
+    if len(mv) < 10:  # minimum: 2 header + 1 len + 1 pad + 6 data_section_min + 2 crc
         return None
-    if raw[0:2] != ZYBL_HEADER:
+    if mv[0] != ZYBL_HEADER[0] or mv[1] != ZYBL_HEADER[1]:
         return None
 
-    length = raw[2]
-    # pad = raw[3]  # always 0x00
-    if len(raw) < length + 6:
+    length = mv[2]
+    # pad = mv[3]  # always 0x00
+    if len(mv) < length + 6:
         return None
 
-    data_section = raw[4:4 + length]
-    crc_received = struct.unpack_from("<H", raw, 4 + length)[0]
-    crc_computed = _crc16_xmodem(data_section)
+    crc_received = _S_H.unpack_from(mv, 4 + length)[0]
+    crc_computed = _crc16_xmodem(mv[4:4 + length])
 
     if crc_received != crc_computed:
         print(f"[zybl] CRC mismatch: got {crc_received:#06x}, expected {crc_computed:#06x}")
@@ -100,8 +128,8 @@ def zybl_parse(raw):
     if length < 6:
         return None
 
-    field1, seq, cid = struct.unpack_from("<HHH", data_section, 0)
-    payload = data_section[6:]
+    field1, seq, cid = _S_HHH.unpack_from(mv, 4)
+    payload = bytes(mv[10:4 + length])
     return (seq, cid, payload)
 
 
@@ -110,12 +138,12 @@ def zybl_parse(raw):
 
 def _control_payload(device_id, value_bytes):
     """Build a control (write) payload: device_id(u16 LE) + 0x01 + value."""
-    return struct.pack("<HB", device_id, 0x01) + value_bytes
+    return _S_HB.pack(device_id, 0x01) + value_bytes
 
 
 def _query_payload(device_id, value_len):
     """Build a query (read) payload: device_id(u16 LE) + 0x00 + zeroes."""
-    return struct.pack("<HB", device_id, 0x00) + b"\x00" * value_len
+    return _S_HB.pack(device_id, 0x00) + b"\x00" * value_len
 
 
 # --- ZYBL response parsing ---
@@ -135,6 +163,18 @@ CID_NAMES = {
 }
 
 
+# Value layout and formatter per CID, for control/query responses
+_RESPONSE_FORMATS = {
+    CID_BRIGHTNESS: (_S_F, lambda bright: f"brightness={bright:.0f}%"),
+    CID_CCT: (_S_H, lambda kelvin: f"cct={kelvin}K"),
+    CID_SATURATION: (_S_F, lambda sat: f"saturation={sat:.0f}%"),
+    CID_HSI: (_S_FFH, lambda hue, sat, intensity: f"hue={hue:.1f} sat={sat:.0f}% intensity={intensity}"),
+    CID_BRIGHTNESS_MODE: (_S_FB, lambda bright, mode: f"brightness={bright:.0f}% mode={mode}"),
+    CID_VOLTAGE: (_S_H, lambda voltage: f"voltage={voltage}"),
+    CID_ONLINE: (_S_H, lambda online: f"online={bool(online)}"),
+}
+
+
 def parse_response(cid, payload):
     """Parse a ZYBL response payload by CID. Returns a human-readable string."""
     name = CID_NAMES.get(cid, f"0x{cid:04x}")
@@ -151,110 +191,153 @@ def parse_response(cid, payload):
     if len(payload) < 3:
         return f"[{name}] payload={payload.hex()}"
 
-    device_id = struct.unpack_from("<H", payload, 0)[0]
-    flag = payload[2]
-    value = payload[3:]
+    # Unpack at offsets rather than slicing the value out
+    device_id, flag = _S_HB.unpack_from(payload, 0)
 
-    if cid == CID_BRIGHTNESS and len(value) >= 4:
-        bright = struct.unpack_from("<f", value, 0)[0]
-        return f"[{name}] device={device_id} brightness={bright:.0f}%"
+    fmt = _RESPONSE_FORMATS.get(cid)
+    if fmt is not None:
+        st, render = fmt
+        if len(payload) - 3 >= st.size:
+            return f"[{name}] device={device_id} {render(*st.unpack_from(payload, 3))}"
 
-    if cid == CID_CCT and len(value) >= 2:
-        kelvin = struct.unpack_from("<H", value, 0)[0]
-        return f"[{name}] device={device_id} cct={kelvin}K"
-
-    if cid == CID_SATURATION and len(value) >= 4:
-        sat = struct.unpack_from("<f", value, 0)[0]
-        return f"[{name}] device={device_id} saturation={sat:.0f}%"
-
-    if cid == CID_HSI and len(value) >= 10:
-        hue, sat, intensity = struct.unpack_from("<ffH", value, 0)
-        return f"[{name}] device={device_id} hue={hue:.1f} sat={sat:.0f}% intensity={intensity}"
-
-    if cid == CID_BRIGHTNESS_MODE and len(value) >= 5:
-        bright = struct.unpack_from("<f", value, 0)[0]
-        mode = struct.unpack_from("<b", value, 4)[0]
-        return f"[{name}] device={device_id} brightness={bright:.0f}% mode={mode}"
-
-    if cid == CID_VOLTAGE and len(value) >= 2:
-        voltage = struct.unpack_from("<H", value, 0)[0]
-        return f"[{name}] device={device_id} voltage={voltage}"
-
-    if cid == CID_ONLINE and len(value) >= 2:
-        online = struct.unpack_from("<H", value, 0)[0]
-        return f"[{name}] device={device_id} online={bool(online)}"
-
-    return f"[{name}] device={device_id} flag={flag:#x} value={value.hex()}"
+    return f"[{name}] device={device_id} flag={flag:#x} value={memoryview(payload)[3:].hex()}"
 
 
 class GattController:
     """Direct BLE GATT controller for Zhiyun lights via BlueZ D-Bus."""
 
-    def __init__(self, bus):
+    def __init__(self, bus, cache_characteristics=True):
         self._bus = bus
         self._state = STATE_DISCONNECTED
         self._seq = 0
         self._device_id = None  # mfid from BLE advertisement (u16)
-
-        # Discovered devices: list of (path, name, mac, rssi, mfid)
-        self._discovered = []
+        self._trace = False  # hex-dump every frame sent/received
+        # (device_id, control prefix, query prefix), rebuilt if device_id changes
+        self._payload_prefixes = None
+
+        # Discovered devices in scan order: {mac: (path, name, mac, rssi, mfid)}
+        self._discovered = {}
+        self._scanning = False
+        self._scan_props_signal = None  # Device1 PropertiesChanged, only while scanning
+        # Scan result lines waiting for the next idle flush
+        self._discovered_lines = []
+        self._adapter = None  # cached Adapter1 proxy, reused by every scan
+
+        # BlueZ object tree {path: {iface: props}}: fetched with one
+        # GetManagedObjects, then kept current from InterfacesAdded/Removed.
+        # Device1 props are only followed during a scan, so the tree is
+        # dropped when one ends, and also if bluetoothd restarts
+        self._objects = None
+        self._om_signals = []
+        self._bluez_owner = None  # unique bus name of bluetoothd when cached
 
         # Connected device state
         self._device_path = None
         self._write_char_path = None
         self._read_char_path = None
+        self._write_char = None  # cached proxies, valid while connected
+        self._read_char = None
+        # Write char lists write-without-response, so setters may skip the ack
+        self._write_without_response = False
+
+        # {device_path: (write_char_path, read_char_path)} from earlier connects
+        # this session; BlueZ keeps GATT object paths stable per device
+        self._use_char_cache = cache_characteristics
+        self._char_cache = {}
         self._props_signal = None
         self._notify_signal = None
 
+        # Sockets from AcquireWrite/AcquireNotify (None = use D-Bus path)
+        self._write_fd = None
+        self._write_mtu = 0
+        self._notify_fd = None
+        self._notify_mtu = 0
+        self._notify_watch = None
+
+        # Coalesced setter values: {cid: value_bytes}, flushed by a GLib timer
+        self._pending = {}
+        self._flush_id = None
+
     @property
     def state(self):
         return self._state
 
+    def enable_trace(self, enabled=True):
+        """Turn hex dumps of outgoing (>>) and incoming (<<) frames on/off."""
+        self._trace = bool(enabled)
+        print(f"[ble] Trace {'on' if self._trace else 'off'}.")
+
     # --- Scanning ---
 
     def scan(self, seconds=10):
         """Scan for Zhiyun lights advertising the 0xFEE9 service."""
+        if self._scanning:
+            print("[ble] Scan already in progress.")
+            return
         self._discovered.clear()
 
-        try:
-            adapter = dbus.Interface(
-                self._bus.get_object(BLUEZ_SERVICE, ADAPTER_PATH),
-                ADAPTER_IFACE,
-            )
-        except dbus.exceptions.DBusException as e:
-            print(f"[ble] Cannot access adapter: {e.get_dbus_message()}")
-            return
+        if self._adapter is None:
+            try:
+                self._adapter = dbus.Interface(
+                    self._bus.get_object(BLUEZ_SERVICE, ADAPTER_PATH, introspect=False),
+                    ADAPTER_IFACE,
+                )
+            except dbus.exceptions.DBusException as e:
+                print(f"[ble] Cannot access adapter: {e.get_dbus_message()}")
+                return
+        adapter = self._adapter
 
-        # Set discovery filter to BLE only
+        # LE only, and no repeat reports for devices BlueZ already knows.
+        # No UUIDs filter: lights that don't advertise 0xFEE9 are still
+        # matched by name in _maybe_add_device.
         try:
-            adapter.SetDiscoveryFilter({"Transport": dbus.String("le")})
+            # Explicit a{sv}: the proxy skips introspection, and dbus-python
+            # would otherwise guess the value type from the first entry
+            adapter.SetDiscoveryFilter(dbus.Dictionary({
+                "Transport": dbus.String("le"),
+                "DuplicateData": dbus.Boolean(False),
+            }, signature="sv"))
         except dbus.exceptions.DBusException:
             pass  # filter not critical
 
-        # Listen for new devices
-        sig = self._bus.add_signal_receiver(
-            self._on_interfaces_added,
-            dbus_interface=DBUS_OM_IFACE,
-            signal_name="InterfacesAdded",
+        # New devices arrive through the object cache's InterfacesAdded
+        # handler while _scanning is set, and Name/UUIDs/RSSI often only
+        # show up later as Device1 PropertiesChanged; subscribe before
+        # discovery starts so none of them are missed
+        self._scanning = True
+        self._scan_props_signal = self._bus.add_signal_receiver(
+            self._on_device_properties_changed,
+            bus_name=BLUEZ_SERVICE,
+            dbus_interface=DBUS_PROPS_IFACE,
+            signal_name="PropertiesChanged",
+            arg0=DEVICE_IFACE,
+            path_keyword="path",
         )
 
-        # Also check already-known devices
-        self._check_existing_devices()
-
         try:
             adapter.StartDiscovery()
             print(f"[ble] Scanning for {seconds} seconds...")
         except dbus.exceptions.DBusException as e:
             print(f"[ble] StartDiscovery failed: {e.get_dbus_message()}")
-            sig.remove()
+            self._end_scan()
+            if e.get_dbus_name() in (
+                "org.freedesktop.DBus.Error.UnknownObject",
+                "org.freedesktop.DBus.Error.ServiceUnknown",
+            ):
+                self._adapter = None  # adapter or bluetoothd gone; re-resolve next time
             return
 
+        # Devices BlueZ already knows won't be announced again; list them
+        # under the "Scanning" line
+        self._check_existing_devices()
+
         def _stop_scan():
             try:
                 adapter.StopDiscovery()
             except dbus.exceptions.DBusException:
                 pass
-            sig.remove()
+            self._end_scan()
+            self._flush_discovered_lines()
             if not self._discovered:
                 print("[ble] No Zhiyun lights found.")
             else:
@@ -263,14 +346,50 @@ class GattController:
 
         GLib.timeout_add_seconds(seconds, _stop_scan)
 
-    def _check_existing_devices(self):
-        """Check BlueZ ObjectManager for already-known devices with 0xFEE9."""
-        try:
+    def _end_scan(self):
+        """Stop following device properties once a scan is over."""
+        self._scanning = False
+        if self._scan_props_signal is not None:
+            self._scan_props_signal.remove()
+            self._scan_props_signal = None
+        # Device1 props in the tree go stale from here on; refetch on next use
+        self._objects = None
+
+    def _managed_objects(self):
+        """Return the cached BlueZ object tree, fetching it on first use.
+
+        Raises DBusException if the initial GetManagedObjects fails.
+        """
+        if not self._om_signals:
+            # Subscribe before fetching so nothing added in between is missed
+            self._om_signals = [
+                self._bus.add_signal_receiver(
+                    handler,
+                    bus_name=BLUEZ_SERVICE,
+                    dbus_interface=DBUS_OM_IFACE,
+                    signal_name=signal,
+                )
+                for handler, signal in (
+                    (self._on_interfaces_added, "InterfacesAdded"),
+                    (self._on_interfaces_removed, "InterfacesRemoved"),
+                )
+            ]
+            self._om_signals.append(
+                self._bus.watch_name_owner(BLUEZ_SERVICE, self._on_bluez_owner_changed)
+            )
+        if self._objects is None:
             om = dbus.Interface(
                 self._bus.get_object(BLUEZ_SERVICE, "/"),
                 DBUS_OM_IFACE,
             )
             objects = om.GetManagedObjects()
+            self._objects = {str(path): dict(ifaces) for path, ifaces in objects.items()}
+        return self._objects
+
+    def _check_existing_devices(self):
+        """Check BlueZ ObjectManager for already-known devices with 0xFEE9."""
+        try:
+            objects = self._managed_objects()
         except dbus.exceptions.DBusException:
             return
 
@@ -279,28 +398,64 @@ class GattController:
                 self._maybe_add_device(path, ifaces[DEVICE_IFACE])
 
     def _on_interfaces_added(self, path, ifaces):
-        """Signal handler for new BlueZ objects (discovered devices)."""
-        if DEVICE_IFACE in ifaces:
+        """Signal handler for new BlueZ objects (devices, GATT services/chars)."""
+        if self._objects is not None:
+            self._objects.setdefault(str(path), {}).update(ifaces)
+        if self._scanning and DEVICE_IFACE in ifaces:
             self._maybe_add_device(path, ifaces[DEVICE_IFACE])
 
+    def _on_interfaces_removed(self, path, interfaces):
+        """Signal handler for BlueZ objects going away."""
+        path = str(path)
+        if self._objects is not None and path in self._objects:
+            entry = self._objects[path]
+            for iface in interfaces:
+                entry.pop(iface, None)
+            if not entry:
+                del self._objects[path]
+        if DEVICE_IFACE in interfaces:
+            # Device removed from BlueZ; its GATT paths won't come back as-is
+            self._char_cache.pop(path, None)
+
+    def _on_device_properties_changed(self, interface, changed, invalidated, path=None):
+        """Scan-time signal handler: apply Device1 property updates to the cached tree."""
+        if self._objects is None:
+            return
+        props = self._objects.get(str(path), {}).get(DEVICE_IFACE)
+        if props is None:
+            return
+        props.update(changed)
+        for name in invalidated:
+            props.pop(name, None)
+        # A device may only qualify once its Name or UUIDs show up
+        self._maybe_add_device(path, props)
+
+    def _on_bluez_owner_changed(self, owner):
+        """bluetoothd started, exited or restarted: everything cached from it is stale."""
+        if self._bluez_owner is not None and owner != self._bluez_owner:
+            self._objects = None
+            self._char_cache.clear()
+            self._adapter = None
+        self._bluez_owner = owner
+
     def _maybe_add_device(self, path, props):
         """Add device to discovered list if it looks like a Zhiyun light."""
-        name = str(props.get("Name", props.get("Alias", "")))
-        uuids = [str(u).lower() for u in props.get("UUIDs", [])]
+        # Skip duplicates before decoding anything else
+        mac = str(props.get("Address", ""))
+        if mac in self._discovered:
+            return
+
+        name = str(props.get("Name") or props.get("Alias") or "")
+        # Name check first; the UUID list is only decoded if it fails
         is_zhiyun = (
-            ZY_SERVICE_UUID in uuids
-            or name.upper().startswith("PL")  # PL103, PLM103, etc.
+            name.upper().startswith("PL")  # PL103, PLM103, etc.
+            or ZY_SERVICE_UUID in (str(u).lower() for u in props.get("UUIDs", ()))
         )
         if not is_zhiyun:
             return
 
-        # Skip duplicates
-        for _, _, mac, _, _ in self._discovered:
-            if mac == str(props.get("Address", "")):
-                return
-
-        name = str(props.get("Name", props.get("Alias", "Unknown")))
-        mac = str(props.get("Address", "??:??:??:??:??:??"))
+        name = name or "Unknown"
+        display_mac = mac or "??:??:??:??:??:??"
         rssi = int(props.get("RSSI", 0))
 
         # Extract mfid from ManufacturerData (device_id for ZYBL protocol)
@@ -313,9 +468,19 @@ class GattController:
             break
 
         idx = len(self._discovered)
-        self._discovered.append((str(path), name, mac, rssi, mfid))
+        self._discovered[mac] = (str(path), name, display_mac, rssi, mfid)
         mfid_str = f"  mfid={mfid:#06x}" if mfid is not None else ""
-        print(f"  [{idx}] {name}  {mac}  RSSI={rssi}{mfid_str}")
+        # Keep the signal handler short: print in one batch from an idle callback
+        if not self._discovered_lines:
+            GLib.idle_add(self._flush_discovered_lines)
+        self._discovered_lines.append(f"  [{idx}] {name}  {display_mac}  RSSI={rssi}{mfid_str}")
+
+    def _flush_discovered_lines(self):
+        """Print queued scan results in one write (GLib idle callback)."""
+        if self._discovered_lines:
+            print("\n".join(self._discovered_lines))
+            self._discovered_lines.clear()
+        return False
 
     # --- Connection ---
 
@@ -335,11 +500,10 @@ class GattController:
             if target < 0 or target >= len(self._discovered):
                 print(f"[ble] Invalid index {target}. Run 'ble scan' first.")
                 return
-            device_path = self._discovered[target][0]
-            mfid = self._discovered[target][4]
+            device_path, name, mac, _, mfid = list(self._discovered.values())[target]
             if mfid is not None:
                 print(f"[ble] Model ID (mfid): {mfid:#06x}")
-            print(f"[ble] Connecting to {self._discovered[target][1]} ({self._discovered[target][2]})...")
+            print(f"[ble] Connecting to {name} ({mac})...")
         else:
             # MAC address — convert to BlueZ path
             mac_path = target.upper().replace(":", "_")
@@ -350,11 +514,15 @@ class GattController:
         self._state = STATE_CONNECTING
 
         # Watch for property changes (Connected, ServicesResolved)
+        # Match on sender and arg0 (the interface name) so dbus-daemon drops
+        # other PropertiesChanged traffic before it ever reaches Python
         self._props_signal = self._bus.add_signal_receiver(
             self._on_properties_changed,
+            bus_name=BLUEZ_SERVICE,
             dbus_interface=DBUS_PROPS_IFACE,
             signal_name="PropertiesChanged",
             path=device_path,
+            arg0=DEVICE_IFACE,
         )
 
         try:
@@ -372,8 +540,14 @@ class GattController:
 
     def _on_connect_error(self, error):
         print(f"[ble] Connect failed: {error.get_dbus_message()}")
+        self._forget_characteristics()
         self._cleanup()
 
+    def _forget_characteristics(self):
+        """Drop cached characteristic paths for the current device."""
+        if self._device_path:
+            self._char_cache.pop(self._device_path, None)
+
     def _on_properties_changed(self, interface, changed, invalidated):
         """Handle property changes on the connected device."""
         if interface != DEVICE_IFACE:
@@ -393,69 +567,151 @@ class GattController:
                 self._resolve_characteristics()
 
     def _resolve_characteristics(self):
-        """Find the Zhiyun write and read characteristics via ObjectManager."""
+        """Find the Zhiyun write and read characteristics.
+
+        Reuses the paths from an earlier connect to the same device if we
+        have them, otherwise walks the ObjectManager tree.
+        """
+        cached = self._char_cache.get(self._device_path) if self._use_char_cache else None
+        if cached:
+            # BlueZ may have re-enumerated the services since; drop paths
+            # that are no longer in the object tree
+            try:
+                objects = self._managed_objects()
+            except dbus.exceptions.DBusException:
+                objects = {}
+            if not all(path in objects for path in cached):
+                self._char_cache.pop(self._device_path, None)
+                cached = None
+        if cached:
+            self._write_char_path, self._read_char_path = cached
+            print("[ble] Using cached characteristics.")
+        elif self._find_characteristics():
+            self._char_cache[self._device_path] = (self._write_char_path, self._read_char_path)
+        else:
+            return
+
+        # Both paths are fixed until disconnect, so build their proxies once.
+        # introspect=False skips the Introspect round-trip; every call we make
+        # on them passes explicitly typed arguments.
+        self._write_char = dbus.Interface(
+            self._bus.get_object(BLUEZ_SERVICE, self._write_char_path, introspect=False),
+            GATT_CHAR_IFACE,
+        )
+        self._read_char = dbus.Interface(
+            self._bus.get_object(BLUEZ_SERVICE, self._read_char_path, introspect=False),
+            GATT_CHAR_IFACE,
+        )
+        self._write_without_response = self._write_char_supports_command()
+
+        # Start notifications on the read characteristic
+        self._start_notify()
+
+    def _find_characteristics(self):
+        """Walk the cached object tree for the device's 0xFEE9 characteristics.
+
+        Returns True once both paths are set; on failure, disconnects.
+        """
         try:
-            om = dbus.Interface(
-                self._bus.get_object(BLUEZ_SERVICE, "/"),
-                DBUS_OM_IFACE,
-            )
-            objects = om.GetManagedObjects()
+            objects = self._managed_objects()
         except dbus.exceptions.DBusException as e:
             print(f"[ble] Failed to enumerate objects: {e.get_dbus_message()}")
             self.disconnect()
-            return
+            return False
 
         self._write_char_path = None
         self._read_char_path = None
 
+        prefix = self._device_path + "/"
         for path, ifaces in objects.items():
-            if not str(path).startswith(self._device_path):
+            if GATT_CHAR_IFACE not in ifaces or not path.startswith(prefix):
                 continue
 
-            if GATT_CHAR_IFACE in ifaces:
-                uuid = str(ifaces[GATT_CHAR_IFACE].get("UUID", "")).lower()
-                if uuid == ZY_WRITE_UUID:
-                    self._write_char_path = str(path)
-                elif uuid == ZY_READ_UUID:
-                    self._read_char_path = str(path)
+            uuid = str(ifaces[GATT_CHAR_IFACE].get("UUID", "")).lower()
+            if uuid == ZY_WRITE_UUID:
+                self._write_char_path = str(path)
+            elif uuid == ZY_READ_UUID:
+                self._read_char_path = str(path)
+            else:
+                continue
+            if self._write_char_path and self._read_char_path:
+                break
 
         if not self._write_char_path or not self._read_char_path:
             print("[ble] Could not find Zhiyun characteristics (0xFEE9 service).")
             print(f"[ble]   Write char: {self._write_char_path or 'NOT FOUND'}")
             print(f"[ble]   Read char:  {self._read_char_path or 'NOT FOUND'}")
             self.disconnect()
-            return
+            return False
 
         print(f"[ble] Found characteristics:")
         print(f"[ble]   Write: {self._write_char_path}")
         print(f"[ble]   Read:  {self._read_char_path}")
+        return True
 
-        # Start notifications on the read characteristic
-        self._start_notify()
+    def _write_char_supports_command(self):
+        """True if the write char's Flags include write-without-response."""
+        try:
+            ifaces = self._managed_objects().get(self._write_char_path, {})
+        except dbus.exceptions.DBusException:
+            return False
+        flags = ifaces.get(GATT_CHAR_IFACE, {}).get("Flags", ())
+        return "write-without-response" in flags
 
     def _start_notify(self):
-        """Enable notifications on the read characteristic."""
+        """Enable notifications on the read characteristic.
+
+        Prefers AcquireNotify/AcquireWrite (BlueZ 5.46+), which hand back a
+        socket so frames skip dbus-daemon. Falls back to StartNotify and
+        WriteValue where the light or BlueZ doesn't offer them. WriteValue is
+        refused while the write socket is held, so write_raw closes it first.
+        """
+        try:
+            fd, mtu = self._read_char.AcquireNotify(_NO_OPTIONS)
+            self._notify_fd = fd.take()
+            self._notify_mtu = int(mtu)
+            self._notify_watch = GLib.io_add_watch(
+                self._notify_fd,
+                GLib.PRIORITY_DEFAULT,
+                GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR,
+                self._on_notify_fd,
+            )
+            print("[ble] Notifications enabled (acquired).")
+        except dbus.exceptions.DBusException:
+            self._start_notify_signal()
+
+        # Only offered for characteristics with write-without-response
+        if self._write_without_response:
+            try:
+                fd, mtu = self._write_char.AcquireWrite(_NO_OPTIONS)
+                self._write_fd = fd.take()
+                self._write_mtu = int(mtu)
+            except dbus.exceptions.DBusException:
+                pass
+
+        self._state = STATE_READY
+        self._seq = 0
+        print("[ble] Ready.")
+
+    def _start_notify_signal(self):
+        """Fallback: StartNotify and watch the read char's Value property."""
         # Listen for Value changes on the read char
         self._notify_signal = self._bus.add_signal_receiver(
             self._on_char_properties_changed,
+            bus_name=BLUEZ_SERVICE,
             dbus_interface=DBUS_PROPS_IFACE,
             signal_name="PropertiesChanged",
             path=self._read_char_path,
+            arg0=GATT_CHAR_IFACE,
+            byte_arrays=True,
         )
 
         try:
-            char = dbus.Interface(
-                self._bus.get_object(BLUEZ_SERVICE, self._read_char_path),
-                GATT_CHAR_IFACE,
-            )
-            char.StartNotify()
+            self._read_char.StartNotify()
             print("[ble] Notifications enabled.")
         except dbus.exceptions.DBusException as e:
             print(f"[ble] StartNotify failed: {e.get_dbus_message()}")
-
-        self._state = STATE_READY
-        self._seq = 0
-        print("[ble] Ready.")
+            self._forget_characteristics()
 
     def _on_char_properties_changed(self, interface, changed, invalidated):
         """Handle notifications from the read characteristic."""
@@ -464,16 +720,38 @@ class GattController:
         if "Value" not in changed:
             return
 
-        value = bytes(changed["Value"])
-        print(f"[ble] << {value.hex()}")
+        # byte_arrays=True: Value is already a dbus.ByteArray (a bytes subclass)
+        self._handle_notification(changed["Value"])
+
+    def _on_notify_fd(self, fd, condition):
+        """GLib IO callback for the AcquireNotify socket (one read per notification)."""
+        if condition & (GLib.IO_HUP | GLib.IO_ERR):
+            # BlueZ closes the socket when notifications stop or the link drops
+            self._notify_watch = None
+            self._close_notify_fd()
+            return False
+        try:
+            value = os.read(fd, self._notify_mtu)
+        except OSError:
+            return True
+        self._handle_notification(value)
+        return True
+
+    def _handle_notification(self, value):
+        """Parse and print one notification from the read characteristic."""
+        if self._trace:
+            print(f"[ble] << {value.hex()}")
 
         parsed = zybl_parse(value)
         if parsed:
             seq, cid, payload = parsed
             info = parse_response(cid, payload)
-            print(f"[ble]    {info}")
-        else:
+            # Indent under the << line when there is one
+            print(f"[ble]    {info}" if self._trace else f"[ble] {info}")
+        elif self._trace:
             print(f"[ble]    (not a valid ZYBL frame)")
+        else:
+            print(f"[ble] << {value.hex()} (not a valid ZYBL frame)")
 
     # --- Disconnection ---
 
@@ -504,38 +782,88 @@ class GattController:
         if self._notify_signal:
             self._notify_signal.remove()
             self._notify_signal = None
+        if self._notify_watch is not None:
+            GLib.source_remove(self._notify_watch)
+            self._notify_watch = None
+        self._close_notify_fd()
+        self._close_write_fd()
         self._device_path = None
         self._write_char_path = None
         self._read_char_path = None
+        self._write_char = None
+        self._read_char = None
+        self._write_without_response = False
         self._device_id = None
+        self._payload_prefixes = None
+        if self._flush_id is not None:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = None
+        self._pending.clear()
         self._state = STATE_DISCONNECTED
 
+    def _close_notify_fd(self):
+        if self._notify_fd is not None:
+            os.close(self._notify_fd)
+            self._notify_fd = None
+
+    def _close_write_fd(self):
+        if self._write_fd is not None:
+            os.close(self._write_fd)
+            self._write_fd = None
+
     # --- Writing ---
 
-    def write_raw(self, data):
-        """Write raw bytes to the write characteristic (no ZYBL framing)."""
+    def write_raw(self, data, with_response=False):
+        """Write raw bytes to the write characteristic (no ZYBL framing).
+
+        with_response=False sends a Write Without Response if the
+        characteristic allows it (over the AcquireWrite socket while it is
+        held and the frame fits), else a Write Request. with_response=True
+        always sends a Write Request; BlueZ refuses WriteValue on an acquired
+        char, so that releases the socket for the rest of the connection.
+        Either way the light's reply (if any) arrives as a notification on
+        the read char.
+        """
         if self._state != STATE_READY:
             print(f"[ble] Not ready (state={self._state}).")
             return
 
-        print(f"[ble] >> {data.hex()}")
+        if self._trace:
+            print(f"[ble] >> {data.hex()}")
+
+        # Acquired socket: one write() per ATT Write Without Response, whose
+        # value is limited to ATT_MTU - 3 (opcode + handle)
+        if self._write_fd is not None:
+            if not with_response and len(data) <= self._write_mtu - 3:
+                try:
+                    os.write(self._write_fd, data)
+                    return
+                except OSError as e:
+                    print(f"[ble] Socket write failed ({e.strerror}), using WriteValue.")
+            # Closing the socket releases the acquired write, which is what
+            # lets WriteValue through; stay on WriteValue for this connection
+            self._close_write_fd()
+
         try:
-            char = dbus.Interface(
-                self._bus.get_object(BLUEZ_SERVICE, self._write_char_path),
-                GATT_CHAR_IFACE,
-            )
-            char.WriteValue(
-                dbus.Array(data, signature="y"),
-                dbus.Dictionary({"type": dbus.String("request")}, signature="sv"),
-            )
+            if with_response or not self._write_without_response:
+                opts = _WRITE_OPTS_REQUEST
+            else:
+                opts = _WRITE_OPTS_COMMAND
+            # ByteArray marshals as 'ay' straight from the buffer instead of
+            # boxing each byte as dbus.Byte the way dbus.Array does
+            self._write_char.WriteValue(dbus.ByteArray(data), opts)
         except dbus.exceptions.DBusException as e:
             print(f"[ble] Write failed: {e.get_dbus_message()}")
+            # A stale cached path shows up as a failed/unknown object; resolve
+            # from scratch on the next connect
+            if e.get_dbus_name() in ("org.bluez.Error.Failed", "org.freedesktop.DBus.Error.UnknownObject"):
+                self._forget_characteristics()
 
-    def send_command(self, cid, payload=b""):
+    def send_command(self, cid, payload=b"", with_response=False):
         """Build a ZYBL frame and write it."""
         self._seq += 1
         frame = zybl_frame(cid, payload, self._seq)
-        self.write_raw(frame)
+        self.write_raw(frame, with_response)
 
     # --- Status ---
 
@@ -550,6 +878,7 @@ class GattController:
             print(f"[ble] Read char:  {self._read_char_path}")
         if self._discovered:
             print(f"[ble] Discovered: {len(self._discovered)} device(s)")
+        print(f"[ble] Trace: {'on' if self._trace else 'off'}")
 
     # --- High-level light control ---
 
@@ -564,34 +893,66 @@ class GattController:
             return self._device_id
         return 0
 
+    def _prefixes(self):
+        """Return (control, query) payload prefixes for the current device_id."""
+        device_id = self._get_device_id()
+        cached = self._payload_prefixes
+        if cached is None or cached[0] != device_id:
+            cached = (device_id, _control_payload(device_id, b""), _query_payload(device_id, 0))
+            self._payload_prefixes = cached
+        return cached[1], cached[2]
+
+    def _queue_control(self, cid, value_bytes):
+        """Queue a control write for cid, replacing any not yet sent."""
+        self._pending[cid] = value_bytes
+        if self._flush_id is None:
+            self._flush_id = GLib.timeout_add(COALESCE_MS, self._flush_pending)
+
+    def _flush_pending(self):
+        """GLib timer callback: send the latest queued value per cid."""
+        self._flush_id = None
+        pending, self._pending = self._pending, {}
+        ctrl_prefix = self._prefixes()[0]
+        for cid, value_bytes in pending.items():
+            self.send_command(cid, ctrl_prefix + value_bytes)
+        return False
+
+    def _drain_pending(self):
+        """Send queued control writes now, so a following query sees them."""
+        if self._flush_id is not None:
+            GLib.source_remove(self._flush_id)
+            self._flush_pending()
+
     def set_brightness(self, value):
         """Set brightness. value: 0-100 (percent)."""
         value = max(0.0, min(100.0, float(value)))
-        payload = _control_payload(self._get_device_id(), struct.pack("<f", value))
-        self.send_command(CID_BRIGHTNESS, payload)
+        self._queue_control(CID_BRIGHTNESS, _S_F.pack(value))
         print(f"[ble] Setting brightness to {value:.0f}%")
 
     def get_brightness(self):
         """Query current brightness."""
-        payload = _query_payload(self._get_device_id(), 4)
-        self.send_command(CID_BRIGHTNESS, payload)
+        self._drain_pending()
+        payload = self._prefixes()[1] + bytes(4)
+        self.send_command(CID_BRIGHTNESS, payload, with_response=True)
 
     def set_cct(self, kelvin):
         """Set color temperature in Kelvin (2700-6500)."""
         kelvin = max(2700, min(6500, int(kelvin)))
-        payload = _control_payload(self._get_device_id(), struct.pack("<H", kelvin))
-        self.send_command(CID_CCT, payload)
+        self._queue_control(CID_CCT, _S_H.pack(kelvin))
         print(f"[ble] Setting CCT to {kelvin}K")
 
     def get_cct(self):
         """Query current color temperature."""
-        payload = _query_payload(self._get_device_id(), 2)
-        self.send_command(CID_CCT, payload)
+        self._drain_pending()
+        payload = self._prefixes()[1] + bytes(2)
+        self.send_command(CID_CCT, payload, with_response=True)
 
     def query_info(self):
         """Query device info (serial, model)."""
-        self.send_command(CID_DEVICE_INFO)
+        self._drain_pending()
+        self.send_command(CID_DEVICE_INFO, with_response=True)
 
     def query_device_id(self):
         """Query device ID via CID 0x2005 (no-payload command)."""
-        self.send_command(CID_DEVICE_ID)
+        self._drain_pending()
+        self.send_command(CID_DEVICE_ID, with_response=True)
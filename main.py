@@ -1,12 +1,11 @@
 """Zyvega CLI — control Zhiyun Vega PL103 lights via Bluetooth Mesh.
 
-Uses GLib main loop with non-blocking stdin for interactive commands
-while D-Bus callbacks fire in the background.
+Uses a GLib main loop for D-Bus callbacks; a reader thread blocks on stdin
+and hands each command line to the loop via GLib.idle_add.
 """
 
-import fcntl
-import os
 import sys
+import threading
 
 import dbus
 from dbus.mainloop.glib import DBusGMainLoop
@@ -30,6 +29,7 @@ BLE commands:
   ble connect <idx|mac>     Connect to a light
   ble disconnect            Disconnect
   ble status                Show connection state
+  ble trace <on|off>        Hex-dump frames sent/received
 
 Mesh commands (requires bluetooth-mesh.service):
   mesh start                Connect to mesh daemon
@@ -42,46 +42,133 @@ Mesh commands (requires bluetooth-mesh.service):
   quit                      Exit
 """
 
+# 'get' target (and aliases) -> GattController query method
+GET_TARGETS = {
+    "brightness": GattController.get_brightness,
+    "bright": GattController.get_brightness,
+    "b": GattController.get_brightness,
+    "cct": GattController.get_cct,
+    "temp": GattController.get_cct,
+    "t": GattController.get_cct,
+    "info": GattController.query_info,
+    "devid": GattController.query_device_id,
+    "deviceid": GattController.query_device_id,
+    "id": GattController.query_device_id,
+}
+
+
+def _ble_scan(gatt, parts):
+    seconds = 10
+    if len(parts) > 2:
+        try:
+            seconds = int(parts[2])
+        except ValueError:
+            print("Usage: ble scan [seconds]")
+            return
+    gatt.scan(seconds)
+
+
+def _ble_connect(gatt, parts):
+    if len(parts) < 3:
+        print("Usage: ble connect <index|MAC>")
+        return
+    target = parts[2]
+    if ":" in target:
+        gatt.connect(target)
+    else:
+        try:
+            gatt.connect(int(target))
+        except ValueError:
+            print("Usage: ble connect <index|MAC>")
+
+
+def _ble_trace(gatt, parts):
+    if len(parts) < 3 or parts[2].lower() not in ("on", "off"):
+        print("Usage: ble trace <on|off>")
+        return
+    gatt.enable_trace(parts[2].lower() == "on")
+
+
+BLE_COMMANDS = {
+    "scan": _ble_scan,
+    "connect": _ble_connect,
+    "disconnect": lambda gatt, parts: gatt.disconnect(),
+    "status": lambda gatt, parts: gatt.status(),
+    "trace": _ble_trace,
+}
+
 
 def handle_ble_command(gatt, parts):
     """Handle 'ble <subcommand>' commands."""
     if len(parts) < 2:
-        print("Usage: ble <scan|connect|disconnect|status> ...")
+        print("Usage: ble <scan|connect|disconnect|status|trace> ...")
         return
 
     sub = parts[1].lower()
+    handler = BLE_COMMANDS.get(sub)
+    if handler is None:
+        print(f"Unknown ble subcommand: {sub}")
+        return
+    handler(gatt, parts)
 
-    if sub == "scan":
-        seconds = 10
-        if len(parts) > 2:
-            try:
-                seconds = int(parts[2])
-            except ValueError:
-                print("Usage: ble scan [seconds]")
-                return
-        gatt.scan(seconds)
-
-    elif sub == "connect":
-        if len(parts) < 3:
-            print("Usage: ble connect <index|MAC>")
+
+def _mesh_start(state):
+    if state["mesh"]:
+        print("[mesh] Already started.")
+        return
+    try:
+        from zyvega import MeshController
+        state["mesh"] = MeshController(state["bus"])
+        state["mesh"].initialize()
+    except dbus.exceptions.DBusException as e:
+        print(f"[mesh] Cannot connect to bluetooth-mesh daemon: {e.get_dbus_message()}")
+        print("[mesh] Is bluetooth-mesh.service running?")
+        state["mesh"] = None
+
+
+def _mesh_scan(controller, parts):
+    seconds = 10
+    if len(parts) > 2:
+        try:
+            seconds = int(parts[2])
+        except ValueError:
+            print("Usage: mesh scan [seconds]")
             return
-        target = parts[2]
-        if ":" in target:
-            gatt.connect(target)
-        else:
-            try:
-                gatt.connect(int(target))
-            except ValueError:
-                print("Usage: ble connect <index|MAC>")
+    controller.start_scan(seconds)
 
-    elif sub == "disconnect":
-        gatt.disconnect()
 
-    elif sub == "status":
-        gatt.status()
+def _mesh_provision(controller, parts):
+    if len(parts) < 3:
+        print("Usage: mesh provision <scan_index>")
+        return
+    try:
+        idx = int(parts[2])
+    except ValueError:
+        print("Usage: mesh provision <scan_index>")
+        return
+    controller.provision_device(idx)
 
-    else:
-        print(f"Unknown ble subcommand: {sub}")
+
+def _mesh_configure(controller, parts):
+    if len(parts) < 3:
+        print("Usage: mesh configure <unicast_addr>")
+        return
+    try:
+        addr = int(parts[2], 0)
+    except ValueError:
+        print("Usage: mesh configure <unicast_addr>  (e.g. 0x0002)")
+        return
+    controller.configure_device(addr)
+
+
+# Subcommands that need a started MeshController ('start' is handled first)
+MESH_COMMANDS = {
+    "scan": _mesh_scan,
+    "provision": _mesh_provision,
+    "configure": _mesh_configure,
+    "nodes": lambda controller, parts: controller.list_nodes(),
+    "reset": lambda controller, parts: controller.reset_network(),
+}
 
 
 def handle_mesh_command(state, parts):
@@ -93,17 +180,7 @@ def handle_mesh_command(state, parts):
     sub = parts[1].lower()
 
     if sub == "start":
-        if state["mesh"]:
-            print("[mesh] Already started.")
-            return
-        try:
-            from zyvega import MeshController
-            state["mesh"] = MeshController(state["bus"])
-            state["mesh"].initialize()
-        except dbus.exceptions.DBusException as e:
-            print(f"[mesh] Cannot connect to bluetooth-mesh daemon: {e.get_dbus_message()}")
-            print("[mesh] Is bluetooth-mesh.service running?")
-            state["mesh"] = None
+        _mesh_start(state)
         return
 
     controller = state["mesh"]
@@ -111,46 +188,11 @@ def handle_mesh_command(state, parts):
         print("[mesh] Not started. Run 'mesh start' first (requires bluetooth-mesh.service).")
         return
 
-    if sub == "scan":
-        seconds = 10
-        if len(parts) > 2:
-            try:
-                seconds = int(parts[2])
-            except ValueError:
-                print("Usage: mesh scan [seconds]")
-                return
-        controller.start_scan(seconds)
-
-    elif sub == "provision":
-        if len(parts) < 3:
-            print("Usage: mesh provision <scan_index>")
-            return
-        try:
-            idx = int(parts[2])
-        except ValueError:
-            print("Usage: mesh provision <scan_index>")
-            return
-        controller.provision_device(idx)
-
-    elif sub == "configure":
-        if len(parts) < 3:
-            print("Usage: mesh configure <unicast_addr>")
-            return
-        try:
-            addr = int(parts[2], 0)
-        except ValueError:
-            print("Usage: mesh configure <unicast_addr>  (e.g. 0x0002)")
-            return
-        controller.configure_device(addr)
-
-    elif sub == "nodes":
-        controller.list_nodes()
-
-    elif sub == "reset":
-        controller.reset_network()
-
-    else:
+    handler = MESH_COMMANDS.get(sub)
+    if handler is None:
         print(f"Unknown mesh subcommand: {sub}")
+        return
+    handler(controller, parts)
 
 
 def handle_light_command(gatt, cmd, parts):
@@ -186,18 +228,31 @@ def handle_light_command(gatt, cmd, parts):
         else:
             what = parts[1].lower()
 
-        if what in ("brightness", "bright", "b"):
-            gatt.get_brightness()
-        elif what in ("cct", "temp", "t"):
-            gatt.get_cct()
-        elif what == "info":
-            gatt.query_info()
-        elif what in ("devid", "deviceid", "id"):
-            gatt.query_device_id()
+        query = GET_TARGETS.get(what)
+        if query:
+            query(gatt)
         else:
             print(f"Unknown get target: {what}. Try: brightness, cct, info, devid")
 
 
+def _light(state, cmd, parts):
+    handle_light_command(state["gatt"], cmd, parts)
+
+
+# Top-level command -> handler(state, cmd, parts)
+COMMANDS = {
+    "help": lambda state, cmd, parts: print(HELP_TEXT),
+    "ble": lambda state, cmd, parts: handle_ble_command(state["gatt"], parts),
+    "mesh": lambda state, cmd, parts: handle_mesh_command(state, parts),
+    "brightness": _light,
+    "cct": _light,
+    "get": _light,
+    "info": _light,
+}
+
+QUIT_COMMANDS = frozenset(("quit", "exit", "q"))
+
+
 def handle_command(state, line):
     """Parse and dispatch a CLI command."""
     parts = line.strip().split()
@@ -206,48 +261,35 @@ def handle_command(state, line):
 
     cmd = parts[0].lower()
 
-    if cmd in ("quit", "exit", "q"):
+    if cmd in QUIT_COMMANDS:
         return False
 
-    elif cmd == "help":
-        print(HELP_TEXT)
-
-    elif cmd == "ble":
-        handle_ble_command(state["gatt"], parts)
-
-    elif cmd == "mesh":
-        handle_mesh_command(state, parts)
-
-    elif cmd in ("brightness", "cct", "get", "info"):
-        handle_light_command(state["gatt"], cmd, parts)
-
-    else:
+    handler = COMMANDS.get(cmd)
+    if handler is None:
         print(f"Unknown command: {cmd}. Type 'help' for available commands.")
+    else:
+        handler(state, cmd, parts)
 
     return True
 
 
-def on_stdin(fd, condition, state):
-    """GLib IO callback for stdin."""
-    if condition & GLib.IO_IN:
-        try:
-            line = sys.stdin.readline()
-        except (IOError, OSError):
-            return True
-
-        if not line:
-            # EOF
-            loop.quit()
-            return False
+def read_stdin(state):
+    """Reader thread: block on stdin and hand each line to the GLib loop."""
+    for line in sys.stdin:
+        GLib.idle_add(on_line, state, line)
+    GLib.idle_add(on_line, state, "")  # EOF
 
-        if not handle_command(state, line):
-            loop.quit()
-            return False
 
-        sys.stdout.write("> ")
-        sys.stdout.flush()
+def on_line(state, line):
+    """Idle callback: run one stdin line on the main loop thread."""
+    if not line or not handle_command(state, line):
+        # EOF or quit
+        loop.quit()
+        return False
 
-    return True
+    sys.stdout.write("> ")
+    sys.stdout.flush()
+    return False
 
 
 loop = None
@@ -267,28 +309,22 @@ def main():
         "mesh": None,  # lazy-initialized via 'mesh start'
     }
 
-    # Set stdin to non-blocking
-    flags = fcntl.fcntl(sys.stdin.fileno(), fcntl.F_GETFL)
-    fcntl.fcntl(sys.stdin.fileno(), fcntl.F_SETFL, flags | os.O_NONBLOCK)
-
     # Print banner
     print(HELP_TEXT)
 
-    # Set up stdin watch
-    GLib.io_add_watch(sys.stdin, GLib.IO_IN, on_stdin, state)
-
     sys.stdout.write("> ")
     sys.stdout.flush()
 
-    # Run main loop
     loop = GLib.MainLoop()
+
+    # Blocking reads happen off the main loop; commands still run on it
+    threading.Thread(target=read_stdin, args=(state,), daemon=True).start()
+
+    # Run main loop
     try:
         loop.run()
     except KeyboardInterrupt:
         print("\nExiting...")
-    finally:
-        # Restore stdin flags
-        fcntl.fcntl(sys.stdin.fileno(), fcntl.F_SETFL, flags)
 
 
 if __name__ == "__main__":
@@ -7,13 +7,11 @@ No external dependencies — only stdlib + system GLib/dbus bindings.
 import json
 import os
 import struct
-import sys
 import uuid as uuid_mod
 from pathlib import Path
 
 import dbus
 import dbus.service
-from dbus.mainloop.glib import DBusGMainLoop
 
 # BlueZ mesh D-Bus constants
 MESH_SERVICE = "org.bluez.mesh"
@@ -51,6 +49,16 @@ TOKEN_PATH = CONFIG_DIR / "token"
 NODES_PATH = CONFIG_DIR / "nodes.json"
 
 
+def _write_atomic(path, text):
+    """Replace path with text via a temp file, so a crash never leaves it torn."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
 def _opcode_bytes(opcode):
     """Encode a mesh opcode to bytes (1 or 2 byte SIG opcodes)."""
     if opcode < 0x80:
@@ -85,6 +93,23 @@ def _parse_opcode(data):
         return opcode, data[3:]
 
 
+# Empty a{sv} options argument, shared by every call that takes one
+_NO_OPTIONS = dbus.Dictionary({}, signature="sv")
+
+# Fixed config messages / prefixes, built once
+_COMPOSITION_DATA_GET_PAGE0 = _opcode_bytes(OP_COMPOSITION_DATA_GET) + bytes([0x00])
+_MODEL_APP_BIND_OPCODE = _opcode_bytes(OP_MODEL_APP_BIND)
+# ModelAppBind params: element addr, app key index, vendor company id, model id
+_S_MODEL_APP_BIND = struct.Struct("<HHHH")
+
+# Composition Data Status page 0: page, CID, PID, VID, CRPL, Features
+_S_COMPOSITION_HEADER = struct.Struct("<BHHHHH")
+# Element header: location, number of SIG models, number of vendor models
+_S_ELEMENT_HEADER = struct.Struct("<HBB")
+_S_SIG_MODEL = struct.Struct("<H")
+_S_VENDOR_MODEL = struct.Struct("<HH")  # company_id, model_id
+
+
 class MeshApplication(dbus.service.Object):
     """Exports Application1, Provisioner1, and ObjectManager interfaces."""
 
@@ -215,7 +240,7 @@ class MeshController:
     def __init__(self, bus):
         self._bus = bus
         self._mesh_net = dbus.Interface(
-            bus.get_object(MESH_SERVICE, MESH_PATH),
+            bus.get_object(MESH_SERVICE, MESH_PATH, introspect=False),
             MESH_NETWORK_IFACE,
         )
         self._token = None
@@ -225,8 +250,12 @@ class MeshController:
 
         # Scan results: list of (rssi, uuid_bytes, options)
         self._scan_results = []
+        # {data: index into _scan_results}, for O(1) duplicate checks
+        self._scan_index = {}
         # Provisioned nodes: {uuid_hex: {unicast, company_id, vendor_model_id, configured}}
         self._nodes = {}
+        # Same node dicts keyed by primary unicast address
+        self._nodes_by_unicast = {}
         # Next unicast address to assign
         self._next_unicast = 0x0002
 
@@ -252,28 +281,32 @@ class MeshController:
 
         if NODES_PATH.exists():
             try:
-                self._nodes = json.loads(NODES_PATH.read_text())
+                self._nodes = json.loads(NODES_PATH.read_bytes())
                 # Compute next unicast from existing nodes
                 for info in self._nodes.values():
                     uc = info.get("unicast", 0)
+                    self._nodes_by_unicast[uc] = info
                     if uc >= self._next_unicast:
                         self._next_unicast = uc + 1
             except (json.JSONDecodeError, OSError):
                 self._nodes = {}
+                self._nodes_by_unicast = {}
 
     def _save_token(self):
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        TOKEN_PATH.write_text(f"{self._token:016x}\n")
+        _write_atomic(TOKEN_PATH, f"{self._token:016x}\n")
 
     def _save_nodes(self):
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        NODES_PATH.write_text(json.dumps(self._nodes, indent=2) + "\n")
+        _write_atomic(NODES_PATH, json.dumps(self._nodes, indent=2) + "\n")
 
     def _setup_node_interfaces(self):
         """Set up Node1 and Management1 interfaces after attach/create."""
         if not self._node_path:
             return
-        node_obj = self._bus.get_object(MESH_SERVICE, self._node_path)
+        # Every call passes explicitly typed arguments, so skip the Introspect
+        # round-trip dbus-python would otherwise make on first use
+        node_obj = self._bus.get_object(MESH_SERVICE, self._node_path, introspect=False)
         self._node_iface = dbus.Interface(node_obj, MESH_NODE_IFACE)
         self._mgmt_iface = dbus.Interface(node_obj, MESH_MANAGEMENT_IFACE)
 
@@ -315,7 +348,7 @@ class MeshController:
         app_uuid = uuid_mod.uuid4().bytes
         self._mesh_net.CreateNetwork(
             dbus.ObjectPath(APP_PATH),
-            dbus.Array(app_uuid, signature="y"),
+            dbus.ByteArray(app_uuid),
             reply_handler=lambda: print("[mesh] CreateNetwork accepted, waiting for JoinComplete..."),
             error_handler=lambda e: print(f"[mesh] CreateNetwork failed: {e.get_dbus_message()}"),
         )
@@ -336,6 +369,7 @@ class MeshController:
             print("[mesh] Not attached to network yet.")
             return
         self._scan_results.clear()
+        self._scan_index.clear()
         options = {"Seconds": dbus.UInt16(seconds)}
         try:
             self._mgmt_iface.UnprovisionedScan(dbus.Dictionary(options, signature="sv"))
@@ -345,19 +379,20 @@ class MeshController:
 
     def _on_scan_result(self, rssi, data, options):
         """Called by Provisioner1.ScanResult — unprovisioned device found."""
-        # data is the UUID (16 bytes)
-        uuid_hex = data.hex()
         # Check if we already have this device
-        for i, (_, existing_data, _) in enumerate(self._scan_results):
-            if existing_data == data:
-                # Update RSSI
-                self._scan_results[i] = (rssi, data, options)
-                return
+        idx = self._scan_index.get(data)
+        if idx is not None:
+            # Update RSSI
+            self._scan_results[idx] = (rssi, data, options)
+            return
 
         idx = len(self._scan_results)
+        self._scan_index[data] = idx
         self._scan_results.append((rssi, data, options))
+        # data is the UUID (16 bytes) followed by OOB info; only format new devices
+        uuid_hex = data[:16].hex()
         oob_info = int.from_bytes(data[16:18], "big") if len(data) > 16 else 0
-        print(f"  [{idx}] UUID={uuid_hex[:32]}  RSSI={rssi}  OOB={oob_info:#06x}")
+        print(f"  [{idx}] UUID={uuid_hex}  RSSI={rssi}  OOB={oob_info:#06x}")
 
     # --- Provisioning ---
 
@@ -376,10 +411,9 @@ class MeshController:
         uuid_hex = uuid_bytes.hex()
         print(f"[mesh] Provisioning device UUID={uuid_hex}...")
 
-        options = dbus.Dictionary({}, signature="sv")
         self._mgmt_iface.AddNode(
-            dbus.Array(uuid_bytes, signature="y"),
-            options,
+            dbus.ByteArray(uuid_bytes),
+            _NO_OPTIONS,
             reply_handler=lambda: print("[mesh] AddNode accepted, provisioning in progress..."),
             error_handler=self._on_add_node_call_error,
         )
@@ -399,13 +433,18 @@ class MeshController:
         uuid_hex = uuid_bytes.hex()
         print(f"[mesh] Provisioned! UUID={uuid_hex} unicast={unicast:#06x} elements={count}")
 
-        self._nodes[uuid_hex] = {
+        info = {
             "unicast": unicast,
             "count": count,
             "company_id": None,
             "vendor_model_id": None,
             "configured": False,
         }
+        old = self._nodes.get(uuid_hex)
+        if old is not None:  # re-provisioned: drop the stale address
+            self._nodes_by_unicast.pop(old.get("unicast"), None)
+        self._nodes[uuid_hex] = info
+        self._nodes_by_unicast[unicast] = info
         self._next_unicast = unicast + count
         self._save_nodes()
         self._prov_uuid = None
@@ -424,80 +463,69 @@ class MeshController:
             print("[mesh] Not attached to network yet.")
             return
 
-        # Find the node
-        node_info = None
-        for info in self._nodes.values():
-            if info["unicast"] == unicast:
-                node_info = info
-                break
-        if node_info is None:
+        if unicast not in self._nodes_by_unicast:
             print(f"[mesh] No provisioned node at unicast {unicast:#06x}")
             return
 
         print(f"[mesh] Getting Composition Data from {unicast:#06x}...")
         # Config Composition Data Get: opcode 0x8008, param = page 0
-        data = _opcode_bytes(OP_COMPOSITION_DATA_GET) + bytes([0x00])
-        try:
-            self._node_iface.DevKeySend(
-                dbus.ObjectPath(ELEMENT_PATH),
-                dbus.UInt16(unicast),
-                dbus.Boolean(True),  # remote
-                dbus.UInt16(0),      # net_index
-                dbus.Dictionary({}, signature="sv"),
-                dbus.Array(data, signature="y"),
-            )
-        except dbus.exceptions.DBusException as e:
-            print(f"[mesh] DevKeySend failed: {e.get_dbus_message()}")
+        data = _COMPOSITION_DATA_GET_PAGE0
+        self._node_iface.DevKeySend(
+            dbus.ObjectPath(ELEMENT_PATH),
+            dbus.UInt16(unicast),
+            dbus.Boolean(True),  # remote
+            dbus.UInt16(0),      # net_index
+            _NO_OPTIONS,
+            dbus.ByteArray(data),
+            reply_handler=lambda: None,
+            error_handler=lambda e: print(f"[mesh] DevKeySend failed: {e.get_dbus_message()}"),
+        )
 
     def _add_app_key(self, unicast):
         """Create app key locally and distribute to node."""
         print(f"[mesh] Creating and adding AppKey to {unicast:#06x}...")
-        try:
-            self._mgmt_iface.CreateAppKey(
-                dbus.UInt16(0),  # net_index
-                dbus.UInt16(0),  # app_index
-            )
-        except dbus.exceptions.DBusException as e:
-            msg = e.get_dbus_message()
-            if "Already Exists" in msg or "AlreadyExists" in msg:
-                pass  # Key already exists, that's fine
-            else:
-                print(f"[mesh] CreateAppKey failed: {msg}")
-                return
+        self._mgmt_iface.CreateAppKey(
+            dbus.UInt16(0),  # net_index
+            dbus.UInt16(0),  # app_index
+            reply_handler=lambda: self._send_app_key(unicast),
+            error_handler=lambda e: self._on_create_app_key_error(unicast, e),
+        )
 
-        # AddAppKey distributes the key to the remote node
-        try:
-            self._node_iface.AddAppKey(
-                dbus.ObjectPath(ELEMENT_PATH),
-                dbus.UInt16(unicast),
-                dbus.UInt16(0),  # app_index
-                dbus.UInt16(0),  # net_index
-                dbus.Boolean(False),  # update
-            )
-            print("[mesh] AddAppKey sent, waiting for status...")
-        except dbus.exceptions.DBusException as e:
-            print(f"[mesh] AddAppKey failed: {e.get_dbus_message()}")
+    def _on_create_app_key_error(self, unicast, error):
+        msg = error.get_dbus_message()
+        if "Already Exists" in msg or "AlreadyExists" in msg:
+            self._send_app_key(unicast)  # Key already exists, that's fine
+        else:
+            print(f"[mesh] CreateAppKey failed: {msg}")
+
+    def _send_app_key(self, unicast):
+        """AddAppKey distributes the key to the remote node (async)."""
+        self._node_iface.AddAppKey(
+            dbus.ObjectPath(ELEMENT_PATH),
+            dbus.UInt16(unicast),
+            dbus.UInt16(0),  # app_index
+            dbus.UInt16(0),  # net_index
+            dbus.Boolean(False),  # update
+            reply_handler=lambda: print("[mesh] AddAppKey sent, waiting for status..."),
+            error_handler=lambda e: print(f"[mesh] AddAppKey failed: {e.get_dbus_message()}"),
+        )
 
     def _bind_model(self, unicast, company_id, model_id):
         """Bind app key to vendor model on the node."""
         print(f"[mesh] Binding AppKey to vendor model {company_id:#06x}:{model_id:#06x} on {unicast:#06x}...")
         # ModelAppBind: opcode 0x803D
         # Params: element_addr (2 LE) + app_key_index (2 LE) + model_id (vendor: company_id 2 LE + model_id 2 LE)
-        payload = struct.pack("<HH", unicast, 0)  # element addr, app key index
-        payload += struct.pack("<HH", company_id, model_id)  # vendor model
-        data = _opcode_bytes(OP_MODEL_APP_BIND) + payload
-        try:
-            self._node_iface.DevKeySend(
-                dbus.ObjectPath(ELEMENT_PATH),
-                dbus.UInt16(unicast),
-                dbus.Boolean(True),
-                dbus.UInt16(0),
-                dbus.Dictionary({}, signature="sv"),
-                dbus.Array(data, signature="y"),
-            )
-            print("[mesh] ModelAppBind sent, waiting for status...")
-        except dbus.exceptions.DBusException as e:
-            print(f"[mesh] ModelAppBind failed: {e.get_dbus_message()}")
+        data = _MODEL_APP_BIND_OPCODE + _S_MODEL_APP_BIND.pack(unicast, 0, company_id, model_id)
+        self._node_iface.DevKeySend(
+            dbus.ObjectPath(ELEMENT_PATH),
+            dbus.UInt16(unicast),
+            dbus.Boolean(True),
+            dbus.UInt16(0),
+            _NO_OPTIONS,
+            dbus.ByteArray(data),
+            reply_handler=lambda: print("[mesh] ModelAppBind sent, waiting for status..."),
+            error_handler=lambda e: print(f"[mesh] ModelAppBind failed: {e.get_dbus_message()}"),
+        )
 
     def _on_dev_key_message_received(self, source, remote, net_index, data):
         """Handle config messages (composition data status, appkey status, etc.)."""
@@ -513,21 +541,19 @@ class MeshController:
             if status == 0:
                 print(f"[config] AppKey added successfully to {source:#06x}")
                 # Now bind the vendor model
-                for info in self._nodes.values():
-                    if info["unicast"] == source and info.get("company_id") is not None:
-                        self._bind_model(source, info["company_id"], info["vendor_model_id"])
-                        break
+                info = self._nodes_by_unicast.get(source)
+                if info and info.get("company_id") is not None:
+                    self._bind_model(source, info["company_id"], info["vendor_model_id"])
             else:
                 print(f"[config] AppKey status from {source:#06x}: error={status:#04x}")
         elif opcode == OP_MODEL_APP_STATUS:
             status = params[0] if len(params) > 0 else 0xFF
             if status == 0:
                 print(f"[config] Model bound successfully on {source:#06x}")
-                for info in self._nodes.values():
-                    if info["unicast"] == source:
-                        info["configured"] = True
-                        self._save_nodes()
-                        break
+                info = self._nodes_by_unicast.get(source)
+                if info:
+                    info["configured"] = True
+                    self._save_nodes()
                 print("[config] Device fully configured! Ready for control commands.")
             else:
                 print(f"[config] ModelAppBind status from {source:#06x}: error={status:#04x}")
@@ -542,14 +568,9 @@ class MeshController:
             print(f"[config] Composition data too short ({len(params)} bytes)")
             return
 
-        page = params[0]
         # Composition Data page 0 format:
-        # CID (2) + PID (2) + VID (2) + CRPL (2) + Features (2) + Elements...
-        cid = struct.unpack_from("<H", params, 1)[0]
-        pid = struct.unpack_from("<H", params, 3)[0]
-        vid = struct.unpack_from("<H", params, 5)[0]
-        crpl = struct.unpack_from("<H", params, 7)[0]
-        features = struct.unpack_from("<H", params, 9)[0]
+        # Page (1) + CID (2) + PID (2) + VID (2) + CRPL (2) + Features (2) + Elements...
+        page, cid, pid, vid, crpl, features = _S_COMPOSITION_HEADER.unpack_from(params, 0)
 
         print(f"\n{'='*60}")
         print(f"  Composition Data (page {page}) from {source:#06x}")
@@ -565,15 +586,13 @@ class MeshController:
         print(f"    Low Power:{'yes' if features & 0x08 else 'no'}")
 
         # Parse elements
-        offset = 11
+        offset = _S_COMPOSITION_HEADER.size
         elem_idx = 0
         vendor_models = []
         while offset < len(params):
             if offset + 4 > len(params):
                 break
-            loc = struct.unpack_from("<H", params, offset)[0]
-            num_s = params[offset + 2]  # number of SIG models
-            num_v = params[offset + 3]  # number of vendor models
+            loc, num_s, num_v = _S_ELEMENT_HEADER.unpack_from(params, offset)
             offset += 4
 
             print(f"\n  Element {elem_idx} (location={loc:#06x}):")
@@ -583,7 +602,7 @@ class MeshController:
             for _ in range(num_s):
                 if offset + 2 > len(params):
                     break
-                model_id = struct.unpack_from("<H", params, offset)[0]
+                model_id, = _S_SIG_MODEL.unpack_from(params, offset)
                 sig_models.append(model_id)
                 offset += 2
             if sig_models:
@@ -593,8 +612,7 @@ class MeshController:
             for _ in range(num_v):
                 if offset + 4 > len(params):
                     break
-                v_cid = struct.unpack_from("<H", params, offset)[0]
-                v_mid = struct.unpack_from("<H", params, offset + 2)[0]
+                v_cid, v_mid = _S_VENDOR_MODEL.unpack_from(params, offset)
                 vendor_models.append((v_cid, v_mid))
                 offset += 4
             if vendor_models:
@@ -608,12 +626,11 @@ class MeshController:
         # Store discovered vendor model info
         if vendor_models:
             v_cid, v_mid = vendor_models[0]  # use first vendor model
-            for info in self._nodes.values():
-                if info["unicast"] == source:
-                    info["company_id"] = v_cid
-                    info["vendor_model_id"] = v_mid
-                    self._save_nodes()
-                    break
+            info = self._nodes_by_unicast.get(source)
+            if info:
+                info["company_id"] = v_cid
+                info["vendor_model_id"] = v_mid
+                self._save_nodes()
             print(f"[config] Discovered vendor model: company={v_cid:#06x} model={v_mid:#06x}")
             # Proceed with app key distribution
             self._add_app_key(source)
@@ -677,7 +694,9 @@ class MeshController:
         self._node_iface = None
         self._mgmt_iface = None
         self._nodes.clear()
+        self._nodes_by_unicast.clear()
         self._scan_results.clear()
+        self._scan_index.clear()
         self._next_unicast = 0x0002
 
         if TOKEN_PATH.exists():